@@ -1,12 +1,15 @@
 import os
 import re
-import random
+import sys
+import mmap
 import shutil
 import pathlib
-import sqlite3
-import platform
+import functools
+import subprocess
 from uuid import uuid4
 from stat import S_IWRITE
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -18,14 +21,27 @@ RESET = "\033[0m"
 REVERSE = "\033[7m"
 NO_REVERSE = "\033[27m"
 
-globaldir = None  # global tmp file dir
+# pattern-dump logging; the decode+format work only happens when enabled
+VERBOSE = os.environ.get("CSP_VERBOSE") == "1"
+
+
+@dataclass
+class PathState:
+    globaldir: pathlib.Path | None = None  # global tmp file dir
+
+
+state = PathState()
 
 
 def pause():
     input(f"\n{REVERSE}Press Enter to continue...{NO_REVERSE}")
 
 
-SYSTEM = platform.system()
+# sys.platform avoids importing the platform module at startup
+_SYS = sys.platform
+SYSTEM = {"win32": "Windows", "darwin": "Darwin"}.get(
+    _SYS, "Linux" if _SYS.startswith("linux") else _SYS
+)
 if SYSTEM not in ("Windows", "Linux", "Darwin"):
     print(f"{RED}[ERR] Unsupported OS: {SYSTEM}{RESET}")
     pause()
@@ -34,17 +50,31 @@ if SYSTEM == "Windows":
     # ANSI Support for OLD Windows
     os.system("color")
 
+# env is effectively constant for the process, look it up once
+_LOCALAPPDATA = os.getenv("LOCALAPPDATA")
+_PATH_ENTRIES = tuple(p for p in os.environ.get("PATH", "").split(os.pathsep) if p)
+
 
 def uuid():
     return str(uuid4())
 
 
-def path(path: str | pathlib.Path):
+def _path_uncached(path: str | pathlib.Path):
     if isinstance(path, str):
         path = path.strip().strip("'\"")
     return pathlib.Path(path).resolve()
 
 
+_path_cached = functools.lru_cache(maxsize=512)(_path_uncached)
+
+
+def path(path: str | pathlib.Path):
+    try:
+        return _path_cached(path)
+    except TypeError:  # unhashable input
+        return _path_uncached(path)
+
+
 def remove_readonly(path: pathlib.Path):
     try:
         os.chmod(path, S_IWRITE)
@@ -52,197 +82,16 @@ def remove_readonly(path: pathlib.Path):
         pass
 
 
+@functools.lru_cache(maxsize=None)
 def tmppath(tmp: pathlib.Path):
-    global globaldir  # global tmp file dir
-    tmp = next((tmp / "User").glob("glob*"))
-    globaldir = next(tmp for tmp in tmp.glob("*b") if tmp.is_file())
-    return globaldir
-
-
-def appimagepath(p: str):
-    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
-    appimagepath = None
-    if not p:
-        search_paths = [
-            path("/usr/local/bin"),
-            path("/opt"),
-            path("~/Applications").expanduser(),
-            path("~/.local/bin").expanduser(),
-            path("~/Downloads").expanduser(),
-            path("~/Desktop").expanduser(),
-            path("~").expanduser(),
-            path("."),
-        ]
-        paths = os.environ.get("PATH", "").split(os.pathsep)
-        for p in paths:
-            try:
-                search_paths.append(path(p))
-            except:
-                continue
-        for search_path in search_paths:
-            if not search_path.exists() or not search_path.is_dir():
-                continue
-            try:
-                for file in search_path.iterdir():
-                    if not file.is_file():
-                        continue
-                    name = file.name.lower()
-                    if (
-                        name.startswith("cursor")
-                        and not name[6:7].isalpha()
-                        and name.endswith(".appimage")
-                    ):
-                        appimagepath = file
-                        break
-            except:
-                continue
-        if not appimagepath:
-            print(
-                f"{RED}[ERR] Cursor AppImage not found, please enter AppImage path manually{RESET}"
-            )
-            pause()
-            exit()
-    else:
-        appimagepath = path(p)
-        if not appimagepath.exists():
-            print(f"{RED}[ERR] AppImage '{appimagepath}' not found{RESET}")
-            pause()
-            exit()
-    print(f"{GREEN}[√]{RESET} {appimagepath}")
-    return appimagepath
-
-
-def appimage_unpack(appimagepath: pathlib.Path):
-    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
-    if appimagepath.parent != path("."):
-        shutil.copy2(appimagepath, path("."))
-    appimage = path(".") / appimagepath.name
-    squashfs = path(".") / "squashfs-root"
-    os.system(f"chmod +x {appimage}")
-    errorlevel = os.system(f"{appimage} --appimage-extract")
-    if errorlevel != 0:
-        print(f"{RED}[ERR] Failed to unpack AppImage{RESET}")
-        pause()
-        exit()
-    if appimagepath.parent != path("."):
-        os.remove(appimage)
-    print(f"{GREEN}[√] AppImage unpacked -> {squashfs}{RESET}")
-    return squashfs
-
-
-def appimage_repack(appimagepath: pathlib.Path, extract_path: pathlib.Path):
-    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
-    print(f"\n> Repacking AppImage")
-    if not shutil.which("wget"):
-        print(f"{RED}[ERR] Please install wget first{RESET}")
-        pause()
-        exit()
-    appimagetool = path(".") / "appimagetool"
-    appimagetool_downloading = path(".") / "appimagetool_downloading"
-    if appimagetool_downloading.exists():
-        os.remove(appimagetool_downloading)
-    if not appimagetool.exists():
-        print(f"{YELLOW}[WARN] appimagetool not found{RESET}")
-        download = input(f"{PURPLE}Download appimagetool? (Y/n): {RESET}").lower()
-        if download != "n":
-            print(f"{BLUE}[i] Downloading appimagetool...{RESET}")
-            errorlevel = os.system(
-                f"wget https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage -O {appimagetool_downloading}"
-            )
-            if errorlevel != 0:
-                print(
-                    f"{RED}[ERR] Download failed, you can manually download and save it to ./appimagetool\n"
-                    f"Link: {RESET}https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage"
-                )
-                os.remove(appimagetool_downloading)
-                pause()
-                exit()
-            os.system(f"chmod +x {appimagetool_downloading}")
-            os.rename(appimagetool_downloading, appimagetool)
-            print(f"{GREEN}[√] Appimagetool downloaded{RESET}")
-        else:
-            print(
-                f"{RED}[ERR] So please download appimagetool and put it to ./appimagetool to continue\n"
-                f"Link: {RESET}https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage"
-            )
-            pause()
-            exit()
-
-    errorlevel = os.system(f"{appimagetool} {extract_path} {appimagepath}")
-    if errorlevel != 0:
-        print(f"{RED}[ERR] Failed to repack AppImage{RESET}")
-        pause()
-        exit()
-    print(
-        f"{GREEN}[√] AppImage repacked, overwrite {RESET}{appimagepath}\n"
-        f"{GREEN} -- Dont worry, weve already made a backup {RESET}{appimagepath}.bak"
-    )
-
-    shutil.rmtree(extract_path)
-    print(f"{GREEN}[√] Removed temporary directory {extract_path}{RESET}")
-
-
-def appimage_detect_jspath(appimage_unpacked: pathlib.Path):
-    jspaths = [
-        "resources/app/out/main.js",
-        "usr/share/cursor/resources/app/out/main.js",
-    ]
-    for p in jspaths:
-        p = appimage_unpacked / p
-        if p.exists():
-            return p
-    print(f"{RED}[ERR] main.js not found in {appimage_unpacked}{RESET}")
-    pause()
-    exit()
-
-
-def appbundle_movetmp(appbundle: pathlib.Path):
-    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
-    assert appbundle.exists(), f"App Bundle '{appbundle}' not found"
-    appbundle_tmp = appbundle.parent / (appbundle.name + ".tmp")
-    if appbundle_tmp.exists():
-        shutil.rmtree(appbundle_tmp)
-    shutil.copytree(appbundle, appbundle_tmp, symlinks=True)
-    print(f"{GREEN}[√] App Bundle moved to {appbundle_tmp}{RESET}")
-    return appbundle_tmp
-
-
-def appbundle_moveback(appbundle_tmp: pathlib.Path, appbundle: pathlib.Path):
-    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
-    assert appbundle_tmp.exists(), f"App Bundle '{appbundle_tmp}' not found"
-    if appbundle.exists():
-        shutil.rmtree(appbundle)
-    shutil.move(appbundle_tmp, appbundle)
-    print(f"{GREEN}[√] App Bundle moved back to {appbundle}{RESET}")
-
-
-def appbundle_unsign(appbundle: pathlib.Path):
-    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
-    errorlevel = os.system(f"codesign --remove-signature {appbundle}")
-    if errorlevel != 0:
-        print(f"{RED}[ERR] Failed to unsign App Bundle{RESET}")
-        pause()
-        exit()
-    print(f"{GREEN}[√] App Bundle unsigned{RESET}")
-
-
-def appbundle_sign(appbundle: pathlib.Path):
-    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
-    errorlevel = os.system(f"codesign --force --deep --sign - {appbundle}")
-    if errorlevel != 0:
-        print(f"{RED}[ERR] Failed to sign App Bundle{RESET}")
-        pause()
-        exit()
-    print(f"{GREEN}[√] App Bundle signed{RESET}")
-
-
-def appbundle_from_jspath(jspath: pathlib.Path):
-    # /Applications/Cursor.app/Contents/Resources/app/out/main.js
-    return jspath.parent.parent.parent.parent.parent
-
-
-def appbundle_to_jspath(appbundle: pathlib.Path):
-    return appbundle / "Contents" / "Resources" / "app" / "out" / "main.js"
+    # one scandir per level, file type comes from the dirent without extra stats
+    with os.scandir(tmp / "User") as it:
+        tmp = next(e.path for e in it if e.name.startswith("glob"))
+    with os.scandir(tmp) as it:
+        state.globaldir = pathlib.Path(
+            next(e.path for e in it if e.name.endswith("b") and e.is_file())
+        )
+    return state.globaldir
 
 
 def clean_tmp(tmp: pathlib.Path):
@@ -255,27 +104,41 @@ def clean_tmp(tmp: pathlib.Path):
     cleantmp(tmp_glob)  # type:ignore
 
 
-def apppath():
+@functools.lru_cache(maxsize=None)
+def _apppath_cached():
     def is_valid_apppath(base_path: pathlib.Path):
         return (base_path / "out" / "main.js").exists()
 
     def find_cursor_in_path():
-        paths = os.environ.get("PATH", "").split(os.pathsep)
-        for p in paths:
+        # cursor\resources\app\bin\cursor
+        targets = {"cursor"} if SYSTEM != "Windows" else {"cursor", "cursor.exe"}
+
+        def probe(p):
             try:
-                p = path(p)
-                cursorbin = p / "cursor"  # cursor\resources\app\bin\cursor
-                app = p.parent
-                if cursorbin.exists() and is_valid_apppath(app):
+                with os.scandir(p) as it:
+                    if not any(entry.name in targets for entry in it):
+                        return None
+                app = path(p).parent
+                if is_valid_apppath(app):
                     return app
-            except:
-                continue
+            except OSError:
+                pass
+            return None
+
+        if not _PATH_ENTRIES:
+            return None
+        # the per-dir probes are independent I/O, overlap their latency
+        with ThreadPoolExecutor(max_workers=min(8, len(_PATH_ENTRIES))) as ex:
+            for result in ex.map(probe, _PATH_ENTRIES):
+                if result is not None:
+                    return result
         return None
 
     if SYSTEM == "Windows":
-        localappdata = os.getenv("LOCALAPPDATA")
-        assert localappdata, "Panicked: %LOCALAPPDATA% not exist"
-        default_path = path(localappdata) / "Programs" / "cursor" / "resources" / "app"
+        assert _LOCALAPPDATA, "Panicked: %LOCALAPPDATA% not exist"
+        default_path = (
+            path(_LOCALAPPDATA) / "Programs" / "cursor" / "resources" / "app"
+        )
         if is_valid_apppath(default_path):
             return default_path
         if cursor_path := find_cursor_in_path():
@@ -295,23 +158,47 @@ def apppath():
     exit()
 
 
+def apppath():
+    return _apppath_cached()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_jspath():
+    jspath = apppath() / "out" / "main.js"
+    if not jspath.exists():
+        print(f"{RED}[ERR] main.js not found in default path '{jspath}'{RESET}")
+        pause()
+        exit()
+    return jspath
+
+
+@functools.lru_cache(maxsize=None)
+def _jspath_checked(jspath: pathlib.Path):
+    if not jspath.exists():
+        print(f"{RED}[ERR] File '{jspath}' not found{RESET}")
+        pause()
+        exit()
+    return jspath
+
+
 def jspath(p: str | pathlib.Path):
     if not p:
-        jspath = apppath() / "out" / "main.js"
-        if not jspath.exists():
-            print(f"{RED}[ERR] main.js not found in default path '{jspath}'{RESET}")
-            pause()
-            exit()
+        jspath = _default_jspath()
         print(f"{GREEN}[√]{RESET} {jspath}")
     else:
-        jspath = path(p)
-        if not jspath.exists():
-            print(f"{RED}[ERR] File '{jspath}' not found{RESET}")
-            pause()
-            exit()
+        jspath = _jspath_checked(path(p))
     return jspath
 
 
+def reset_path_cache():
+    """Drop memoized detection results (mainly useful for tests)."""
+    _path_cached.cache_clear()
+    tmppath.cache_clear()
+    _apppath_cached.cache_clear()
+    _default_jspath.cache_clear()
+    _jspath_checked.cache_clear()
+
+
 def randomuuid(randomuuid: str):
     if not randomuuid:
         randomuuid = uuid()
@@ -321,22 +208,23 @@ def randomuuid(randomuuid: str):
 
 def macaddr(macaddr: str):
     if not macaddr:
-        while not macaddr or macaddr in (
-            "00:00:00:00:00:00",
-            "ff:ff:ff:ff:ff:ff",
-            "ac:de:48:00:11:22",
-        ):
-            macaddr = ":".join([f"{random.randint(0, 255):02X}" for _ in range(6)])
+        raw = bytearray(os.urandom(6))
+        # locally administered unicast; also cant collide with the
+        # blacklisted 00/ff/ac:de:48 prefixes
+        raw[0] = (raw[0] & 0xFC) | 0x02
+        macaddr = ":".join(f"{b:02X}" for b in raw)
         print(macaddr)
     return macaddr
 
 
 def cleanlog(cachelist=("*Token", "*ID"), conn=None):
     """DEPRECATED. Now we dont need to logout. Calling this should do nothing."""
+    import sqlite3  # deferred, only this deprecated helper needs it
+
     if not conn:
-        if not globaldir or not globaldir.exists():
+        if not state.globaldir or not state.globaldir.exists():
             return
-        conn = sqlite3.connect(globaldir)
+        conn = sqlite3.connect(state.globaldir)
     conn.cursor().execute(
         "DELETE FROM ItemTable WHERE key GLOB ? OR key GLOB ?",
         ["cursor*/" + i for i in cachelist],
@@ -350,12 +238,47 @@ def load(path: pathlib.Path):
         return f.read()
 
 
+def load_mmap(path: pathlib.Path):
+    # zero-copy read-only view for probing, pages come straight from the cache
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_mutable(path: pathlib.Path):
+    # one allocation sized to the file, read straight into it
+    size = os.stat(path).st_size
+    buf = bytearray(size)
+    with open(path, "rb", buffering=0) as f:
+        view = memoryview(buf)
+        read = 0
+        while read < size:
+            n = f.readinto(view[read:])
+            if not n:
+                break
+            read += n
+    return buf
+
+
 def save(path: pathlib.Path, data: bytes):
     print(f"\n> Save {path}")
+    # a hardlinked .bak shares the target's inode, so truncating in place
+    # would clobber the backup; break the link via temp file + rename.
+    # with no extra links a plain in-place write skips the second copy
+    try:
+        hardlinked = os.stat(path).st_nlink > 1
+    except OSError:
+        hardlinked = False
     try:
-        with open(path, "wb") as f:
-            f.write(data)
-            print(f"{GREEN}[√] File saved{RESET}")
+        if hardlinked:
+            newfile = path.with_name(path.name + ".new")
+            with open(newfile, "wb") as f:
+                f.write(data)
+            shutil.copymode(path, newfile)
+            os.replace(newfile, path)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        print(f"{GREEN}[√] File saved{RESET}")
     except PermissionError:
         print(
             f"{RED}[ERR] The file '{path}' is in use, please close it and try again{RESET}"
@@ -364,8 +287,86 @@ def save(path: pathlib.Path, data: bytes):
         exit()
 
 
-def chk(data: bytes, probes: list[bytes]) -> bool:
-    return any(probe in data for probe in probes)
+try:
+    import hyperscan  # optional: one SIMD pass over all patterns at once
+except ImportError:
+    hyperscan = None
+
+_probe_cache: dict = {}
+_hs_cache: dict = {}
+
+
+def _hs_db(expressions: tuple[bytes, ...], som: bool = False):
+    """Compiled Hyperscan database for the expression set, or None when
+    hyperscan is missing or rejects the patterns. With som the matches
+    report start offsets too (slower compile, needed for span hints)."""
+    if hyperscan is None:
+        return None
+    key = (expressions, som)
+    if key not in _hs_cache:
+        try:
+            flags = hyperscan.HS_FLAG_DOTALL
+            if som:
+                flags |= hyperscan.HS_FLAG_SOM_LEFTMOST
+            db = hyperscan.Database()
+            db.compile(
+                expressions=list(expressions),
+                ids=list(range(len(expressions))),
+                flags=[flags] * len(expressions),
+            )
+        except Exception:
+            db = None
+        _hs_cache[key] = db
+    return _hs_cache[key]
+
+
+def chk_patterns(data: bytes, expressions: tuple[bytes, ...]) -> bool:
+    """chk() for regex expressions: a single Hyperscan pass when available,
+    otherwise one cached compiled alternation scan."""
+    db = _hs_db(expressions)
+    if db is not None:
+        found = []
+        db.scan(
+            data if isinstance(data, bytes) else bytes(data),
+            match_event_handler=lambda id_, *_: found.append(id_),
+        )
+        return bool(found)
+    pattern = _probe_cache.get(expressions)
+    if pattern is None:
+        pattern = re.compile(b"(?:" + b")|(?:".join(expressions) + b")", re.DOTALL)
+        _probe_cache[expressions] = pattern
+    return pattern.search(data) is not None
+
+
+def chk(data: bytes, probes: list[bytes] | re.Pattern) -> bool:
+    # single alternation scan over the buffer instead of one scan per probe;
+    # duck-typed so re2-compiled patterns (not re.Pattern subclasses) work too
+    if hasattr(probes, "search"):
+        return probes.search(data) is not None
+    key = frozenset(probes)
+    pattern = _probe_cache.get(key)
+    if pattern is None:
+        pattern = re.compile(b"|".join(re.escape(p) for p in probes))
+        _probe_cache[key] = pattern
+    return pattern.search(data) is not None
+
+
+def _backup_file(path: pathlib.Path, bak: pathlib.Path):
+    try:
+        os.link(path, bak)  # O(1) on the same filesystem, no data copy
+    except OSError:
+        shutil.copy2(path, bak)
+
+
+def _backup_dir(path: pathlib.Path, bak: pathlib.Path):
+    if SYSTEM == "Linux":
+        # CoW clone on btrfs/xfs, degrades to a plain copy elsewhere
+        errorlevel = subprocess.run(
+            ["cp", "--reflink=auto", "-a", str(path), str(bak)]
+        ).returncode
+        if errorlevel == 0:
+            return
+    shutil.copytree(path, bak, symlinks=True)
 
 
 def backup(path: pathlib.Path, force: bool = False):
@@ -373,58 +374,66 @@ def backup(path: pathlib.Path, force: bool = False):
     bak = path.with_name(path.name + ".bak")
     if not os.path.exists(bak):
         if path.is_dir():
-            shutil.copytree(path, bak, symlinks=True)
+            _backup_dir(path, bak)
         else:
-            shutil.copy2(path, bak)
+            _backup_file(path, bak)
         print(f"{GREEN}[√] Backup created: '{bak.name}'{RESET}")
     elif force:
         if path.is_dir():
             shutil.rmtree(bak)
-            shutil.copytree(path, bak, symlinks=True)
+            _backup_dir(path, bak)
         else:
-            shutil.copy2(path, bak)
+            os.remove(bak)
+            _backup_file(path, bak)
         print(f"{GREEN}[√] Backup updated: '{bak.name}'{RESET}")
     else:
         print(f"{BLUE}[i] Backup '{bak.name}' already exists, good{RESET}")
 
 
-def replace(
-    data: bytes, pattern: str | bytes, replace: str | bytes, probe: str | bytes
-) -> bytes:
-    if isinstance(pattern, str):
-        pattern = pattern.encode()
-    if isinstance(replace, str):
-        replace = replace.encode()
-    if isinstance(probe, str):
-        probe = probe.encode()
-    assert isinstance(pattern, bytes)
-    assert isinstance(replace, bytes)
-    assert isinstance(probe, bytes)
-    print(f"> {pattern.decode()} => {replace.decode()}")
-
-    regex = re.compile(pattern, re.DOTALL)
-    count = len(list(regex.finditer(data)))
-    patched_regex = re.compile(probe, re.DOTALL)
-    patched_count = len(list(patched_regex.finditer(data)))
-
-    if count == 0:
-        if patched_count > 0:
-            print(
-                f"{BLUE}[i] Found {patched_count} pattern{'' if patched_count == 1 else 's'} already patched, will overwrite{RESET}"
-            )
-        else:
-            print(f"{YELLOW}[WARN] Pattern <{pattern}> not found, SKIPPED!{RESET}")
-            return data
+try:
+    import re2  # optional: linear-time scans, no pathological backtracking
+except ImportError:
+    re2 = None
 
-    data, replaced1_count = patched_regex.subn(replace, data)
-    data, replaced2_count = regex.subn(replace, data)
-    replaced_count = replaced1_count + replaced2_count
-    if replaced_count != count + patched_count:
-        print(
-            f"{YELLOW}[WARN] Patched {replaced_count}/{count}, failed {count - replaced_count}{RESET}"
-        )
-    else:
-        print(
-            f"{GREEN}[√] Patched {replaced_count} pattern{'' if count == 1 else 's'}{RESET}"
+
+def compile_patch_pattern(pattern: bytes) -> re.Pattern:
+    """Compile with RE2 when available, falling back to re when re2 is not
+    installed or rejects the pattern syntax."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, re.DOTALL)
+        except Exception:
+            pass
+    return re.compile(pattern, re.DOTALL)
+
+
+def collect_splices(regex: re.Pattern, replace: bytes, buf, lo=0, hi=None):
+    """Scan phase only: return (start, end, replacement) spans without
+    mutating buf, so several patterns can scan the same buffer in parallel.
+    Only expands the template when it has backrefs."""
+    if hi is None:
+        hi = len(buf)
+    hi = min(hi, len(buf))
+    offset = 0
+    try:
+        matches = regex.finditer(buf, lo, hi)
+    except TypeError:
+        # engines without pos/endpos support (re2) scan a copy of the window
+        offset = lo
+        matches = regex.finditer(bytes(buf[lo:hi]))
+    return [
+        (
+            offset + m.start(),
+            offset + m.end(),
+            m.expand(replace) if b"\\" in replace else replace,
         )
-    return data
+        for m in matches
+    ]
+
+
+def apply_splices(buf: bytearray, splices):
+    # right-to-left slice assignment keeps earlier spans valid
+    for start, end, rep in sorted(splices, reverse=True):
+        buf[start:end] = rep
+
+
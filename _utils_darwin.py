@@ -0,0 +1,72 @@
+"""App Bundle helpers, imported only on the macOS branch."""
+
+from _utils import *
+
+
+def appbundle_movetmp(appbundle: pathlib.Path):
+    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
+    assert appbundle.exists(), f"App Bundle '{appbundle}' not found"
+    appbundle_tmp = appbundle.parent / (appbundle.name + ".tmp")
+    if appbundle_tmp.exists():
+        shutil.rmtree(appbundle_tmp)
+    # APFS clonefile copy: instant CoW instead of rewriting the whole bundle
+    errorlevel = subprocess.run(
+        ["cp", "-cR", str(appbundle), str(appbundle_tmp)]
+    ).returncode
+    if errorlevel != 0:
+        if appbundle_tmp.exists():
+            shutil.rmtree(appbundle_tmp)
+        shutil.copytree(appbundle, appbundle_tmp, symlinks=True)
+    print(f"{GREEN}[√] App Bundle moved to {appbundle_tmp}{RESET}")
+    return appbundle_tmp
+
+
+def appbundle_moveback(appbundle_tmp: pathlib.Path, appbundle: pathlib.Path):
+    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
+    assert appbundle_tmp.exists(), f"App Bundle '{appbundle_tmp}' not found"
+    # swap via rename so the old bundle isnt walked before the new one lands
+    appbundle_old = appbundle.with_name(appbundle.name + ".old")
+    if appbundle.exists():
+        if appbundle_old.exists():
+            shutil.rmtree(appbundle_old)
+        os.rename(appbundle, appbundle_old)
+    try:
+        os.rename(appbundle_tmp, appbundle)
+    except OSError:  # cross-device
+        shutil.move(appbundle_tmp, appbundle)
+    if appbundle_old.exists():
+        shutil.rmtree(appbundle_old)
+    print(f"{GREEN}[√] App Bundle moved back to {appbundle}{RESET}")
+
+
+def appbundle_unsign(appbundle: pathlib.Path):
+    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
+    errorlevel = subprocess.run(
+        ["codesign", "--remove-signature", str(appbundle)]
+    ).returncode
+    if errorlevel != 0:
+        print(f"{RED}[ERR] Failed to unsign App Bundle{RESET}")
+        pause()
+        exit()
+    print(f"{GREEN}[√] App Bundle unsigned{RESET}")
+
+
+def appbundle_sign(appbundle: pathlib.Path):
+    assert SYSTEM == "Darwin", "Panicked: App Bundle is only available on macOS"
+    errorlevel = subprocess.run(
+        ["codesign", "--force", "--deep", "--sign", "-", str(appbundle)]
+    ).returncode
+    if errorlevel != 0:
+        print(f"{RED}[ERR] Failed to sign App Bundle{RESET}")
+        pause()
+        exit()
+    print(f"{GREEN}[√] App Bundle signed{RESET}")
+
+
+def appbundle_from_jspath(jspath: pathlib.Path):
+    # /Applications/Cursor.app/Contents/Resources/app/out/main.js
+    return jspath.parent.parent.parent.parent.parent
+
+
+def appbundle_to_jspath(appbundle: pathlib.Path):
+    return appbundle / "Contents" / "Resources" / "app" / "out" / "main.js"
@@ -0,0 +1,175 @@
+"""AppImage helpers, imported only on the Linux branch."""
+
+from _utils import *
+from _utils import _PATH_ENTRIES
+
+# system binary dirs never hold AppImages, dont bother scanning them
+SKIP_DIRS = {"/usr/bin", "/bin", "/sbin", "/usr/sbin"}
+
+# cursor.AppImage, Cursor-0.42.3.AppImage, cursor-dev.AppImage... but not cursors.AppImage
+_APPIMAGE_RE = re.compile(r"^cursor(?:[^a-zA-Z].*)?\.appimage$", re.IGNORECASE)
+
+
+def appimagepath(p: str):
+    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
+    appimagepath = None
+    if not p:
+        search_paths = [
+            path("/usr/local/bin"),
+            path("/opt"),
+            path("~/Applications").expanduser(),
+            path("~/.local/bin").expanduser(),
+            path("~/Downloads").expanduser(),
+            path("~/Desktop").expanduser(),
+            path("~").expanduser(),
+            path("."),
+        ]
+        for p in _PATH_ENTRIES:
+            try:
+                search_paths.append(path(p))
+            except:
+                continue
+        unique_search_paths = dict.fromkeys(search_paths)  # insertion-ordered dedup
+        for search_path in unique_search_paths:
+            if str(search_path) in SKIP_DIRS:
+                continue
+            try:
+                with os.scandir(search_path) as it:
+                    for entry in it:
+                        if _APPIMAGE_RE.match(entry.name) and entry.is_file():
+                            appimagepath = pathlib.Path(entry.path)
+                            break
+            except OSError:
+                continue
+        if not appimagepath:
+            print(
+                f"{RED}[ERR] Cursor AppImage not found, please enter AppImage path manually{RESET}"
+            )
+            pause()
+            exit()
+    else:
+        appimagepath = path(p)
+        if not appimagepath.exists():
+            print(f"{RED}[ERR] AppImage '{appimagepath}' not found{RESET}")
+            pause()
+            exit()
+    print(f"{GREEN}[√]{RESET} {appimagepath}")
+    return appimagepath
+
+
+def appimage_unpack(appimagepath: pathlib.Path):
+    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
+    if appimagepath.parent != path("."):
+        shutil.copy2(appimagepath, path("."))
+    appimage = path(".") / appimagepath.name
+    squashfs = path(".") / "squashfs-root"
+    os.chmod(appimage, os.stat(appimage).st_mode | 0o111)
+    errorlevel = subprocess.run([str(appimage), "--appimage-extract"]).returncode
+    if errorlevel != 0:
+        print(f"{RED}[ERR] Failed to unpack AppImage{RESET}")
+        pause()
+        exit()
+    if appimagepath.parent != path("."):
+        os.remove(appimage)
+    print(f"{GREEN}[√] AppImage unpacked -> {squashfs}{RESET}")
+    return squashfs
+
+
+def appimage_repack(appimagepath: pathlib.Path, extract_path: pathlib.Path):
+    assert SYSTEM == "Linux", "Panicked: AppImage is only available on Linux"
+    print(f"\n> Repacking AppImage")
+    if not shutil.which("wget"):
+        print(f"{RED}[ERR] Please install wget first{RESET}")
+        pause()
+        exit()
+    appimagetool = path(".") / "appimagetool"
+    appimagetool_downloading = path(".") / "appimagetool_downloading"
+    if appimagetool_downloading.exists():
+        os.remove(appimagetool_downloading)
+    if not appimagetool.exists():
+        print(f"{YELLOW}[WARN] appimagetool not found{RESET}")
+        download = input(f"{PURPLE}Download appimagetool? (Y/n): {RESET}").lower()
+        if download != "n":
+            print(f"{BLUE}[i] Downloading appimagetool...{RESET}")
+            errorlevel = subprocess.run(
+                [
+                    "wget",
+                    "https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage",
+                    "-O",
+                    str(appimagetool_downloading),
+                ]
+            ).returncode
+            if errorlevel != 0:
+                print(
+                    f"{RED}[ERR] Download failed, you can manually download and save it to ./appimagetool\n"
+                    f"Link: {RESET}https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage"
+                )
+                os.remove(appimagetool_downloading)
+                pause()
+                exit()
+            os.chmod(
+                appimagetool_downloading,
+                os.stat(appimagetool_downloading).st_mode | 0o111,
+            )
+            os.rename(appimagetool_downloading, appimagetool)
+            print(f"{GREEN}[√] Appimagetool downloaded{RESET}")
+        else:
+            print(
+                f"{RED}[ERR] So please download appimagetool and put it to ./appimagetool to continue\n"
+                f"Link: {RESET}https://github.com/AppImage/appimagetool/releases/download/continuous/appimagetool-x86_64.AppImage"
+            )
+            pause()
+            exit()
+
+    # repack into a temp file and rename over the original: appimagetool
+    # truncates its destination in place, which would also clobber a .bak
+    # hardlinked to the same inode by backup()
+    newimage = appimagepath.with_name(appimagepath.name + ".new")
+    errorlevel = subprocess.run(
+        [str(appimagetool), str(extract_path), str(newimage)]
+    ).returncode
+    if errorlevel != 0:
+        if newimage.exists():
+            os.remove(newimage)
+        print(f"{RED}[ERR] Failed to repack AppImage{RESET}")
+        pause()
+        exit()
+    os.replace(newimage, appimagepath)
+    print(
+        f"{GREEN}[√] AppImage repacked, overwrite {RESET}{appimagepath}\n"
+        f"{GREEN} -- Dont worry, weve already made a backup {RESET}{appimagepath}.bak"
+    )
+
+    shutil.rmtree(extract_path)
+    print(f"{GREEN}[√] Removed temporary directory {extract_path}{RESET}")
+
+
+_HARDCODED_JS_PATHS = (
+    "resources/app/out/main.js",
+    "usr/share/cursor/resources/app/out/main.js",
+)
+
+
+def appimage_detect_jspath(appimage_unpacked: pathlib.Path):
+    # os.path.isfile is one C-level stat per candidate, no pathlib re-parsing
+    base = os.fspath(appimage_unpacked)
+    for rel in _HARDCODED_JS_PATHS:
+        cand = os.path.join(base, rel)
+        if os.path.isfile(cand):
+            return pathlib.Path(cand)
+    # fallback: single walk, first out/main.js wins, junk dirs pruned
+    candidates = []
+    for root, dirs, files in os.walk(appimage_unpacked):
+        dirs[:] = [d for d in dirs if d not in (".git", "node_modules")]
+        if "main.js" in files:
+            candidate = pathlib.Path(root) / "main.js"
+            if os.path.basename(root) == "out":
+                return candidate
+            candidates.append(candidate)
+    if candidates:
+        # prefer resources/app, then the shallowest hit
+        candidates.sort(key=lambda c: ("resources/app" not in str(c), len(str(c))))
+        return candidates[0]
+    print(f"{RED}[ERR] main.js not found in {appimage_unpacked}{RESET}")
+    pause()
+    exit()
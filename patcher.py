@@ -1,7 +1,7 @@
 from _utils import *
+from _utils import _hs_db
 import _utils
-
-globaldir = None
+import fnmatch
 
 print(
     f"""
@@ -12,7 +12,239 @@ print(
 
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
+# each patch pairs a find_pattern matching the original code with a
+# probe_pattern matching an already-patched region, so re-runs overwrite.
+# open-ended spans are bounded ([\s\S]{0,N}?) so a near-miss backtracks at
+# most N bytes instead of crawling the rest of the file. find bounds track
+# the fixed upstream code; probe bounds wrap the user-supplied value and
+# must comfortably exceed any input, or re-runs stop matching the marker
+PATCH_DEFINITIONS = {
+    # async function machineId(returnRaw) {
+    #     let machineid = processOutput(execSync(commands[PLATFORM], { timeout: 5e3 }).toString()),
+    #         hash;
+    #     try {
+    #         hash = (await import("crypto")).createHash("sha256").update(machineid, "utf8").digest("hex");
+    #     } catch {
+    #         hash = uuid();
+    #     }
+    #     return returnRaw ? machineid : hash;
+    # }
+    "machine_id": {
+        "atom": "timeout",
+        "find_pattern": r"=.{0,50}timeout.{0,10}5e3[\s\S]{0,256}?,",
+        "replace_template": '=/*csp1*/"{value}"/*1csp*/,',
+        "probe_pattern": r"=/\*csp1\*/[\s\S]{0,4096}?/\*1csp\*/,",
+    },
+    # function getMacAddress() {
+    #     const interfaces = networkInterfaces();
+    #     for (const name in interfaces) {
+    #         const details = interfaces[name];
+    #         if (details) {
+    #             for (const { mac: m } of details) if (isValidMac(m)) return m;
+    #         }
+    #     }
+    #     throw new Error("Unable to retrieve mac address (unexpected format)");
+    # }
+    "mac_address": {
+        # rare literal used to window the regex scan
+        "atom": "Unable to retrieve mac address",
+        "anchor_literal": "Unable to retrieve mac address",
+        "find_pattern": r"(function .{0,50}\{).{0,300}Unable to retrieve mac address[\s\S]{0,2048}?(\})",
+        "replace_template": '\\1return/*csp2*/"{value}"/*2csp*/;\\2',
+        "probe_pattern": r"()return/\*csp2\*/[\s\S]{0,4096}?/\*2csp\*/;()",
+    },
+    # async function sqmId(errorBind) {
+    #     if (isWindows) {
+    #         const reg = await import("@vscode/windows-registry");
+    #         try {  // REGPATH = "Software\\Microsoft\\SQMClient"
+    #             return (reg.GetStringRegKey("HKEY_LOCAL_MACHINE", REGPATH, "MachineId") || "");
+    #         } catch (e) {
+    #             return errorBind(e), "";
+    #         }
+    #     }
+    #     return "";
+    # }
+    "sqm_id": {
+        "atom": "GetStringRegKey",
+        "find_pattern": r'return.{0,50}\.GetStringRegKey[\s\S]{0,512}?HKEY_LOCAL_MACHINE[\s\S]{0,512}?MachineId[\s\S]{0,512}?\|\|[\s\S]{0,64}?""',
+        "replace_template": 'return/*csp3*/"{value}"/*3csp*/',
+        "probe_pattern": r"return/\*csp3\*/[\s\S]{0,4096}?/\*3csp\*/",
+    },
+    # async function devDeviceId(errorBind) {
+    #     try {
+    #         return await (await import("@vscode/deviceid")).getDeviceId();
+    #     } catch (e) {
+    #         return errorBind(e), uuid();
+    #     }
+    # }
+    "dev_device_id": {
+        "atom": "vscode/deviceid",
+        "find_pattern": r"return.{0,50}vscode\/deviceid[\s\S]{0,512}?getDeviceId\(\)",
+        "replace_template": 'return/*csp4*/"{value}"/*4csp*/',
+        "probe_pattern": r"return/\*csp4\*/[\s\S]{0,4096}?/\*4csp\*/",
+    },
+}
+
+# compile every pattern once at import, detection takes the compiled objects
+for definition in PATCH_DEFINITIONS.values():
+    # only mac_address rebuilds its match via \1/\2 group references
+    definition["_has_backrefs"] = bool(re.search(r"\\\d", definition["replace_template"]))
+    # backref patches stay on re so match.expand keeps working; the rest
+    # take RE2's linear-time engine when it is installed
+    if definition["_has_backrefs"]:
+        definition["_find_re"] = re.compile(
+            definition["find_pattern"].encode(), re.DOTALL
+        )
+        definition["_probe_re"] = re.compile(
+            definition["probe_pattern"].encode(), re.DOTALL
+        )
+    else:
+        definition["_find_re"] = compile_patch_pattern(
+            definition["find_pattern"].encode()
+        )
+        definition["_probe_re"] = compile_patch_pattern(
+            definition["probe_pattern"].encode()
+        )
+    definition["_atom"] = definition["atom"].encode()
+    # everything around {value} is static, so pre-encode the template halves
+    # once; building the replacement is then a single bytes join
+    definition["_replace_parts"] = tuple(
+        part.encode() for part in definition["replace_template"].split("{value}")
+    )
+
+
+# every probe expression; chk_patterns unions them into one scan
+# (Hyperscan when installed, a compiled alternation otherwise)
+PROBE_EXPRESSIONS = tuple(
+    d["probe_pattern"].encode() for d in PATCH_DEFINITIONS.values()
+)
+
+# all find and probe patterns in one table, id = patch_index * 2 + kind
+# (kind 0 = find, 1 = probe), so one Hyperscan pass can locate candidate
+# spans for every patch at once
+_HS_IDS = {}
+_HS_EXPRESSIONS = []
+for _index, (_name, _definition) in enumerate(PATCH_DEFINITIONS.items()):
+    for _kind, _key in enumerate(("find_pattern", "probe_pattern")):
+        _HS_IDS[_index * 2 + _kind] = (_name, _kind)
+        _HS_EXPRESSIONS.append(_definition[_key].encode())
+_HS_EXPRESSIONS = tuple(_HS_EXPRESSIONS)
+
+
+def hyperscan_prescan(data):
+    """One SIMD pass over the whole buffer collecting candidate spans for
+    every pattern; the patch phase then only confirms inside those spans.
+    Returns {patch_name: [find_span, probe_span]} or None when Hyperscan
+    is unavailable (callers fall back to the per-patch scans)."""
+    db = _hs_db(_HS_EXPRESSIONS, som=True)
+    if db is None:
+        return None
+    hints = {name: [None, None] for name in PATCH_DEFINITIONS}
+
+    def on_match(id_, start, end, flags, context):
+        name, kind = _HS_IDS[id_]
+        span = hints[name][kind]
+        if span is None:
+            hints[name][kind] = (start, end)
+        else:
+            hints[name][kind] = (min(span[0], start), max(span[1], end))
+
+    db.scan(
+        data if isinstance(data, bytes) else bytes(data),
+        match_event_handler=on_match,
+    )
+    return hints
+
+
+def detect_single_patch(data, definition, value, hint=None):
+    """Scan-only phase: collect the splices for one patch without mutating
+    data, so all patches can run their scans concurrently. Returns
+    (splices, probe_count). hint is this patch's [find_span, probe_span]
+    from hyperscan_prescan; with it, confirmation only touches the hinted
+    spans instead of rescanning the buffer."""
+    if hint is not None:
+        find_span, probe_span = hint
+        if find_span is None and probe_span is None:
+            return [], 0
+        replace_bytes = value.encode().join(definition["_replace_parts"])
+        # run both scans so mixed states (some sites patched, some not)
+        # converge on a re-run, exactly like the unhinted path below
+        splices = []
+        if probe_span is not None:
+            splices += collect_splices(
+                definition["_probe_re"],
+                replace_bytes,
+                data,
+                max(0, probe_span[0] - 16),
+                probe_span[1] + 16,
+            )
+        probe_count = len(splices)
+        if find_span is not None:
+            splices += collect_splices(
+                definition["_find_re"],
+                replace_bytes,
+                data,
+                max(0, find_span[0] - 16),
+                find_span[1] + 16,
+            )
+        return splices, probe_count
+    # atom prefilter, YARA-style: if the patch's rare literal is absent and
+    # no probe marker is present either, neither regex can match
+    if definition["_atom"] not in data and not chk(data, definition["_probe_re"]):
+        return [], 0
+    replace_bytes = value.encode().join(definition["_replace_parts"])
+    # run the probe and find scans unconditionally: a previous run may have
+    # patched only some of a pattern's sites, and both must be covered for
+    # the file to converge
+    splices = collect_splices(definition["_probe_re"], replace_bytes, data)
+    probe_count = len(splices)
+    anchor = definition.get("anchor_literal")
+    if anchor:
+        # window the backtracking-prone pattern around every occurrence of
+        # its rare literal; main.js ships more than one copy of the function
+        anchor_b = anchor.encode()
+        idx = data.find(anchor_b)
+        while idx >= 0:
+            splices += collect_splices(
+                definition["_find_re"],
+                replace_bytes,
+                data,
+                max(0, idx - 2048),
+                idx + len(anchor_b) + 512,
+            )
+            idx = data.find(anchor_b, idx + 1)
+        # adjacent windows may overlap and report the same span twice
+        splices = list({(s, e): (s, e, r) for s, e, r in splices}.values())
+    else:
+        splices += collect_splices(definition["_find_re"], replace_bytes, data)
+    return splices, probe_count
+
+
+def report_patch(definition, value, splices, probe_count):
+    if VERBOSE:
+        print(
+            f"> {definition['_find_re'].pattern.decode()}"
+            f" => {definition['replace_template'].format(value=value)}"
+        )
+    if not splices:
+        print(
+            f"{YELLOW}[WARN] Pattern <{definition['_find_re'].pattern}> not found, SKIPPED!{RESET}"
+        )
+        return
+    if probe_count > 0:
+        print(
+            f"{BLUE}[i] Found {probe_count} pattern{'' if probe_count == 1 else 's'} already patched, overwritten{RESET}"
+        )
+    print(
+        f"{GREEN}[√] Patched {len(splices)} pattern{'' if len(splices) == 1 else 's'}{RESET}"
+    )
+
+
+
 if SYSTEM == "Linux":
+    # platform helpers live in their own module so the other OSes never load them
+    from _utils_linux import appimagepath, appimage_unpack, appimage_detect_jspath
+
     appimage = appimagepath(
         input(f"\n{PURPLE}Enter AppImage path: {RESET}(leave blank = auto detect) ")
     )
@@ -23,83 +255,68 @@ else:
     js = jspath(
         input(f"\n{PURPLE}Enter main.js path: {RESET}(leave blank = auto detect) ")
     )
-data = load(js)
-is_patched = chk(data, [b"/*csp1*/", b"/*csp2*/", b"/*csp3*/", b"/*csp4*/"])
+# probe the untouched file through a read-only mmap, no copy needed yet;
+# the prescan offsets are valid for the mutable copy loaded below
+with load_mmap(js) as jsmap:
+    is_patched = chk_patterns(jsmap, PROBE_EXPRESSIONS)
+    span_hints = hyperscan_prescan(jsmap)
+data = load_mutable(js)
 
+# gather every input up front so the scan phase is prompt-free
 machineid = randomuuid(
     input(f"\n{PURPLE}MachineId: {RESET}(leave blank = random uuid) ")
 )
-# async function machineId(returnRaw) {
-#     let machineid = processOutput(execSync(commands[PLATFORM], { timeout: 5e3 }).toString()),
-#         hash;
-#     try {
-#         hash = (await import("crypto")).createHash("sha256").update(machineid, "utf8").digest("hex");
-#     } catch {
-#         hash = uuid();
-#     }
-#     return returnRaw ? machineid : hash;
-# }
-data = replace(
-    data,
-    r"=.{0,50}timeout.{0,10}5e3.*?,",
-    f'=/*csp1*/"{machineid}"/*1csp*/,',
-    r"=/\*csp1\*/.*?/\*1csp\*/,",
-)
-
 mac = macaddr(input(f"\n{PURPLE}Mac Address: {RESET}(leave blank = random mac) "))
-# function getMacAddress() {
-#     const interfaces = networkInterfaces();
-#     for (const name in interfaces) {
-#         const details = interfaces[name];
-#         if (details) {
-#             for (const { mac: m } of details) if (isValidMac(m)) return m;
-#         }
-#     }
-#     throw new Error("Unable to retrieve mac address (unexpected format)");
-# }
-data = replace(
-    data,
-    r"(function .{0,50}\{).{0,300}Unable to retrieve mac address.*?(\})",
-    f'\\1return/*csp2*/"{mac}"/*2csp*/;\\2',
-    r"()return/\*csp2\*/.*?/\*2csp\*/;()",
-)
-
 sqm = input(f"\n{PURPLE}Windows SQM Id: {RESET}(leave blank = empty) ")
-# async function sqmId(errorBind) {
-#     if (isWindows) {
-#         const reg = await import("@vscode/windows-registry");
-#         try {  // REGPATH = "Software\\Microsoft\\SQMClient"
-#             return (reg.GetStringRegKey("HKEY_LOCAL_MACHINE", REGPATH, "MachineId") || "");
-#         } catch (e) {
-#             return errorBind(e), "";
-#         }
-#     }
-#     return "";
-# }
-data = replace(
-    data,
-    r'return.{0,50}\.GetStringRegKey.*?HKEY_LOCAL_MACHINE.*?MachineId.*?\|\|.*?""',
-    f'return/*csp3*/"{sqm}"/*3csp*/',
-    r"return/\*csp3\*/.*?/\*3csp\*/",
-)
-
 devid = randomuuid(input(f"\n{PURPLE}devDeviceId: {RESET}(leave blank = random uuid) "))
-# async function devDeviceId(errorBind) {
-#     try {
-#         return await (await import("@vscode/deviceid")).getDeviceId();
-#     } catch (e) {
-#         return errorBind(e), uuid();
-#     }
-# }
-data = replace(
-    data,
-    r"return.{0,50}vscode\/deviceid.*?getDeviceId\(\)",
-    f'return/*csp4*/"{devid}"/*4csp*/',
-    r"return/\*csp4\*/.*?/\*4csp\*/",
-)
+patch_values = {
+    "machine_id": machineid,
+    "mac_address": mac,
+    "sqm_id": sqm,
+    "dev_device_id": devid,
+}
+
+# detection is read-only and re releases the GIL while scanning, so the
+# four patch scans run in parallel; splicing happens once afterwards
+with ThreadPoolExecutor(max_workers=len(patch_values)) as ex:
+    detected = dict(
+        zip(
+            patch_values,
+            ex.map(
+                lambda item: detect_single_patch(
+                    data,
+                    PATCH_DEFINITIONS[item[0]],
+                    item[1],
+                    span_hints[item[0]] if span_hints else None,
+                ),
+                patch_values.items(),
+            ),
+        )
+    )
+
+all_splices = []
+for name, value in patch_values.items():
+    splices, probe_count = detected[name]
+    report_patch(PATCH_DEFINITIONS[name], value, splices, probe_count)
+    all_splices += splices
+
+# patches target disjoint regions; refuse to splice if that ever breaks
+spans = sorted((start, end) for start, end, _ in all_splices)
+for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+    assert prev_end <= next_start, "Panicked: overlapping patch regions"
+apply_splices(data, all_splices)
 
 # Preprocess App Bundle for macOS
 if SYSTEM == "Darwin":
+    from _utils_darwin import (
+        appbundle_sign,
+        appbundle_unsign,
+        appbundle_movetmp,
+        appbundle_moveback,
+        appbundle_to_jspath,
+        appbundle_from_jspath,
+    )
+
     appbundle = appbundle_from_jspath(js)
     backup(appbundle, not is_patched)
     appbundle_tmp = appbundle_movetmp(appbundle)
@@ -126,6 +343,8 @@ if SYSTEM == "Darwin":
 
 # Pack AppImage for Linux
 if SYSTEM == "Linux":
+    from _utils_linux import appimage_repack
+
     assert appimage is not None
     assert appimage_unpacked is not None
     backup(appimage, not is_patched)
@@ -133,17 +352,38 @@ if SYSTEM == "Linux":
 
 
 # Clean Temporary Files
+_glob_matchers = {}
+
+
+def _glob_matcher(filesglob):
+    """compile the glob set once, later calls reuse the specialized matcher"""
+    key = tuple(filesglob)
+    matcher = _glob_matchers.get(key)
+    if matcher is None:
+        matcher = re.compile("|".join(fnmatch.translate(g) for g in key)).match
+        _glob_matchers[key] = matcher
+    return matcher
+
+
 def cleantmp(filesglob=["cache*", "*onfig"]):
     """clean cache-* and .config files"""
-    if not globaldir or not globaldir.exists():
+    globaldir = _utils.state.globaldir
+    if not globaldir:
+        return
+    # one directory listing for all patterns instead of one glob walk each;
+    # scandir itself reports a missing dir, no separate exists() stat needed
+    matcher = _glob_matcher(filesglob)
+    try:
+        entries = list(os.scandir(globaldir))
+    except OSError:
         return
-    assert globaldir
-    for glob in filesglob:
-        for file in globaldir.glob(glob):
-            try:
-                file.unlink()
-            except Exception as e:
-                print(f"{RED}[ERR] Failed to delete {file}: {e}{RESET}")
+    for entry in entries:
+        if not matcher(entry.name):
+            continue
+        try:
+            os.unlink(entry.path)
+        except Exception as e:
+            print(f"{RED}[ERR] Failed to delete {entry.path}: {e}{RESET}")
 
 
 _utils.cleantmp = cleantmp  # type:ignore